@@ -2,14 +2,53 @@
 """
 New vlsm.py
 
-Rewritten VLSM tool using Python's ipaddress module and tabulate for output.
+Rewritten VLSM tool using Python's ipaddress module with a built-in
+grid-style table formatter for output.
 """
 
 from __future__ import annotations
 import sys
+import socket
+import struct
 import ipaddress
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
 from typing import List, Tuple, Optional
-from tabulate import tabulate
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the pure-Python scan works without it
+    njit = None
+
+
+def _build_prefix_table() -> Tuple[Tuple[int, int, int, int], ...]:
+    table = []
+    for prefixlen in range(33):
+        host_bits = 32 - prefixlen
+        block_size = 1 << host_bits
+        usable = block_size - 2 if host_bits >= 2 else 0
+        netmask = (0xFFFFFFFF << host_bits) & 0xFFFFFFFF
+        table.append((block_size, usable, netmask, netmask ^ 0xFFFFFFFF))
+    return tuple(table)
+
+
+# Per-prefix constants indexed by prefix length, computed once at import:
+# (block_size, usable_hosts, netmask_int, wildcard_int) for /0 .. /32.
+_PREFIX_TABLE = _build_prefix_table()
+
+# The same columns as int64 arrays for vectorized lookups by prefix length.
+_BLOCK_BY_PREFIX, _USABLE_BY_PREFIX, _NETMASK_BY_PREFIX, _WILDCARD_BY_PREFIX = (
+    np.array(col, dtype=np.int64) for col in zip(*_PREFIX_TABLE)
+)
+
+_PACK_BE32 = struct.Struct("!I").pack
+
+
+def _ip_str(ip_int: int) -> str:
+    """Dotted-quad string for an IPv4 address int (one C call via inet_ntoa)."""
+    return socket.inet_ntoa(_PACK_BE32(ip_int))
 
 
 def main() -> None:
@@ -42,7 +81,7 @@ def main() -> None:
 
     # Allocate
     try:
-        allocations = allocate_vlsm(base_network, requirements)
+        names, required_arr, starts, prefixes, wasted = allocate_vlsm(base_network, requirements)
     except ValueError as e:
         sys.exit(f"Allocation error: {e}")
 
@@ -52,31 +91,31 @@ def main() -> None:
         headers.append("Wasted IPs")
 
     # Prepare rows in the order allocated (descending-by-size)
-    rows = []
-    for name, required, net, wasted in allocations:
-        rows.append(format_allocation_row(name, required, net, wasted, extra_info))
+    rows = format_allocation_rows(names, starts, prefixes, wasted, extra_info)
 
-    # Tabulate using grid style
-    table_text = tabulate(rows, headers=headers, tablefmt="grid")
+    # Render in grid style
+    table_text = _format_grid(headers, rows)
 
-    # Print to CLI in simple line format
-    print("\n--- VLSM Allocation ---\n")
+    # Print to CLI in simple line format; build everything first and emit it
+    # with one write instead of one print (two writes) per row.
+    lines = ["", "--- VLSM Allocation ---", ""]
     for row in rows:
         # row contains:
         # [Name, Network, Broadcast, Usable Range, Subnet Mask, Wildcard Mask] (+ optional Wasted IPs)
-        name, network_str, broadcast_str, usable_range, subnet_mask, wildcard_mask = row[:6]
-
-        print(f"{name} | {network_str} | {broadcast_str} | {usable_range} | {subnet_mask} | {wildcard_mask} |")
+        lines.append(" | ".join(row[:6]) + " |")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-    # Also write the table text to output.txt
-    with open("output.txt", "w") as out_f:
-        out_f.write(table_text + "\n")
+    # Also write the table text to output.txt. Binary mode with a large buffer
+    # skips the TextIOWrapper layer and lands the whole table in one write().
+    with open("output.txt", "wb", buffering=1 << 18) as out_f:
+        out_f.write((table_text + "\n").encode("utf-8"))
 
     # Exit normally
     return
 
 
+@lru_cache(maxsize=None)
 def prefix_for_usable(required_usable: int) -> int:
     """
     Given required usable hosts, return the smallest prefix length that
@@ -89,13 +128,17 @@ def prefix_for_usable(required_usable: int) -> int:
     if required_usable <= 0:
         raise ValueError("Required usable hosts must be >= 1")
 
+    # We need 2^host_bits - 2 >= required_usable, i.e. 2^host_bits >= required_usable + 2,
+    # so the answer is the bit length of (required_usable + 1), clamped to >= 2 (for /30).
+    host_bits = max(2, (required_usable + 1).bit_length())
+    if (1 << host_bits) - 2 < required_usable:
+        host_bits += 1
+
     # host_bits ranges from 2 (for /30) up to 30 (for /2)
-    for host_bits in range(2, 31):  # host_bits = 32 - prefixlen
-        usable = (1 << host_bits) - 2
-        if usable >= required_usable:
-            return 32 - host_bits
+    if host_bits > 30:
+        raise ValueError("Requirement too large to fit in IPv4")
 
-    raise ValueError("Requirement too large to fit in IPv4")
+    return 32 - host_bits
 
 
 def read_requirements_from_file(filename: str) -> Tuple[str, List[Tuple[str, int]], bool]:
@@ -110,30 +153,33 @@ def read_requirements_from_file(filename: str) -> Tuple[str, List[Tuple[str, int
     extra_info = False
     requirements: List[Tuple[str, int]] = []
 
-    with open(filename, "r") as fh:
-        first = fh.readline().strip()
-        if "|" in first:
-            parts = first.split("|", 1)
-            base = parts[0].strip()
-            statement = parts[1].strip().lower()
-            if statement == "true":
-                extra_info = True
-            elif statement == "false" or statement == "":
-                extra_info = False
-            else:
-                raise ValueError("Invalid extra-info flag in file (use True or False)")
+    # One read() syscall for the whole file; splitting happens in C.
+    lines = Path(filename).read_text().splitlines()
+
+    first = lines[0].strip() if lines else ""
+    base, sep, statement = first.partition("|")
+    if sep:
+        base = base.strip()
+        statement = statement.strip().lower()
+        if statement == "true":
+            extra_info = True
+        elif statement == "false" or statement == "":
+            extra_info = False
         else:
-            base = first
-
-        # read the rest
-        for raw in fh:
-            line = raw.strip()
-            if not line:
-                continue
-            if "|" not in line:
-                raise ValueError(f"Invalid requirement line (expected 'Name|Number'): {line}")
-            name, num = line.split("|", 1)
-            requirements.append((name.strip(), int(num.strip())))
+            raise ValueError("Invalid extra-info flag in file (use True or False)")
+
+    # parse the rest; partition tells us via an empty sep when '|' is missing
+    for raw in lines[1:]:
+        line = raw.strip()
+        if not line:
+            continue
+        name, sep, num = line.partition("|")
+        if not sep:
+            raise ValueError(f"Invalid requirement line (expected 'Name|Number'): {line}")
+        num = num.strip()
+        if not num.isdecimal():
+            raise ValueError(f"Invalid number (expected a positive integer): {num}")
+        requirements.append((name.strip(), int(num)))
 
     return base, requirements, extra_info
 
@@ -149,14 +195,15 @@ def interactive_input() -> Tuple[str, List[Tuple[str, int]], bool]:
         line = input("(x to stop): ").strip()
         if line.lower() == "x":
             break
-        if "|" not in line:
+        name, sep, num = line.partition("|")
+        if not sep:
             print("Invalid format. Use Name|Number.")
             continue
-        name, num = line.split("|", 1)
-        try:
-            reqs.append((name.strip(), int(num.strip())))
-        except ValueError:
+        num = num.strip()
+        if not num.isdecimal():
             print("Number must be an integer.")
+            continue
+        reqs.append((name.strip(), int(num)))
     return base, reqs, False
 
 
@@ -172,72 +219,117 @@ def next_aligned_network_start(current_int: int, prefixlen: int) -> int:
     """
     host_bits = 32 - prefixlen
     block_size = 1 << host_bits
-    # aligned base for the current_int
-    aligned = current_int & (~(block_size - 1))
-    if aligned < current_int:
-        aligned += block_size
-    return aligned
+    # Branchless round-up: adding block_size - 1 then masking with -block_size
+    # (all-ones above the host bits, since Python ints are unbounded) lands on
+    # the block start >= current_int without a conditional.
+    return (current_int + block_size - 1) & -block_size
 
 
-def allocate_vlsm(base_network: ipaddress.IPv4Network,
-                  requirements: List[Tuple[str, int]]) -> List[Tuple[str, int, ipaddress.IPv4Network, int]]:
+def _aligned_starts(base_start: int, block: np.ndarray) -> np.ndarray:
     """
-    Allocate subnets for requirements using VLSM.
+    Run the serial alignment scan: for each block size (in sorted allocation
+    order), round the running cursor up to the block boundary and advance
+    past the block. Returns the aligned start address of each subnet as int64.
 
-    Returns a list of tuples:
-      (name, required_usable, allocated_network, wasted_ips)
-    where wasted_ips = allocated_usable - required_usable
+    This loop cannot be vectorized (each start depends on the previous end),
+    so it is JIT-compiled with numba when available.
     """
-    # Attach original index so we can output in allocation order (we'll present sorted order allocations)
-    reqs_with_index = [(name, required, idx) for idx, (name, required) in enumerate(requirements)]
-
-    # Sort descending by required hosts (Option B)
-    reqs_with_index.sort(key=lambda t: t[1], reverse=True)
-
-    allocations = []
-    current_int = int(base_network.network_address)
-
-    for name, required_usable, orig_idx in reqs_with_index:
-        prefixlen = prefix_for_usable(required_usable)
-        # Find the next aligned network at this prefix >= current_int
-        net_start_int = next_aligned_network_start(current_int, prefixlen)
-
-        # Create the network object
-        net = ipaddress.IPv4Network((net_start_int, prefixlen))
-        # Ensure the allocated net fits inside the base network
-        if net.network_address < base_network.network_address or net.broadcast_address > base_network.broadcast_address:
-            raise ValueError(f"Not enough address space in base network to allocate '{name}' ({required_usable} hosts).")
-
-        # compute allocated usable hosts for this net (special-case /31,/32)
-        host_bits = 32 - net.prefixlen
-        if host_bits >= 2:
-            allocated_usable = (1 << host_bits) - 2
-        else:
-            allocated_usable = 0
+    starts = np.empty_like(block)
+    current_int = base_start
+    for i in range(block.shape[0]):
+        block_size = block[i]
+        aligned = (current_int + block_size - 1) & -block_size
+        starts[i] = aligned
+        current_int = aligned + block_size
+    return starts
 
-        wasted = allocated_usable - required_usable if allocated_usable >= required_usable else 0
 
-        allocations.append((name, required_usable, net, wasted))
+if njit is not None:
+    _aligned_starts = njit(cache=True)(_aligned_starts)
 
-        # move current_int to next IP after this allocated network
-        current_int = int(net.broadcast_address) + 1
-        # If we've run out of addresses for further allocations, further iterations will fail above.
 
-    return allocations
-
-
-def wildcard_from_netmask(netmask: ipaddress.IPv4Address) -> ipaddress.IPv4Address:
-    """
-    Compute wildcard mask (host bits set to 1), which is bitwise NOT of netmask.
+def allocate_vlsm(base_network: ipaddress.IPv4Network,
+                  requirements: List[Tuple[str, int]]) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
-    nm_int = int(netmask)
-    wild_int = (~nm_int) & 0xFFFFFFFF
-    return ipaddress.IPv4Address(wild_int)
+    Allocate subnets for requirements using VLSM.
 
+    Returns parallel columns in allocation (descending-by-size) order:
+      (names, required_usable, network_start_ints, prefixlens, wasted_ips)
+    where wasted_ips = allocated_usable - required_usable. The numeric
+    columns are int64 arrays; the formatting layer turns the addresses into
+    dotted quads.
+    """
+    # Sort descending by required hosts (Option B); itemgetter is a C-level key.
+    sorted_reqs = sorted(requirements, key=itemgetter(1), reverse=True)
+
+    if not sorted_reqs:
+        empty = np.empty(0, dtype=np.int64)
+        return [], empty, empty, empty, empty
+
+    # Reject oversized counts while they are still Python ints: anything past
+    # a /2's usable hosts can't fit, and values near/over 2^63 would overflow
+    # the int64 conversion or wrap in the log2 below.
+    if sorted_reqs[0][1] > (1 << 30) - 2:
+        raise ValueError("Requirement too large to fit in IPv4")
+
+    # Vectorized sizing: prefix lengths and block sizes for all requirements at once.
+    required_arr = np.asarray([required for _, required in sorted_reqs], dtype=np.int64)
+    if np.any(required_arr <= 0):
+        raise ValueError("Required usable hosts must be >= 1")
 
-def format_allocation_row(name: str, required: int, net: ipaddress.IPv4Network, wasted: int, extra_info: bool) -> List[str]:
+    # Need 2^host_bits - 2 >= required, i.e. 2^host_bits >= required + 2.
+    host_bits = np.maximum(2, np.ceil(np.log2(required_arr + 2)).astype(np.int64))
+    # Guard against float rounding on exact power-of-two boundaries.
+    host_bits += (np.int64(1) << host_bits) - 2 < required_arr
+    if np.any(host_bits > 30):
+        raise ValueError("Requirement too large to fit in IPv4")
+
+    prefix_arr = 32 - host_bits
+    block = _BLOCK_BY_PREFIX[prefix_arr]
+    wasted_arr = np.maximum(_USABLE_BY_PREFIX[prefix_arr] - required_arr, 0)
+
+    base_start_int = int(base_network.network_address)
+    base_end_int = int(base_network.broadcast_address)
+
+    # Cheap up-front capacity filter: if the block sizes alone exceed the base
+    # network there is no point running the scan. (Necessary, not sufficient —
+    # alignment gaps can still make a plan that passes this check fail below.)
+    total_needed = int(block.sum())
+    base_size = base_end_int - base_start_int + 1
+    if total_needed > base_size:
+        over = np.cumsum(block) > base_size
+        overflow_names = ", ".join(
+            f"'{name}' ({required} hosts)"
+            for (name, required), bad in zip(sorted_reqs, over) if bad
+        )
+        raise ValueError(
+            f"Requirements need {total_needed} addresses but the base network only has "
+            f"{base_size}; cannot fit: {overflow_names}."
+        )
+
+    # Alignment scan (inherently serial: each start depends on the previous end).
+    starts = _aligned_starts(base_start_int, block)
+
+    # Starts and ends are strictly increasing, so checking the first start and
+    # the last end bounds the whole plan against the base network; report the
+    # first requirement that spills past it.
+    if int(starts[0]) < base_start_int:
+        name, required_usable = sorted_reqs[0]
+        raise ValueError(f"Not enough address space in base network to allocate '{name}' ({required_usable} hosts).")
+    ends = starts + block - 1
+    if ends[-1] > base_end_int:
+        bad = int(np.argmax(ends > base_end_int))
+        name, required_usable = sorted_reqs[bad]
+        raise ValueError(f"Not enough address space in base network to allocate '{name}' ({required_usable} hosts).")
+
+    names = [name for name, _ in sorted_reqs]
+    return names, required_arr, starts, prefix_arr, wasted_arr
+
+
+def format_allocation_rows(names: List[str], starts: np.ndarray, prefixes: np.ndarray,
+                           wasted: np.ndarray, extra_info: bool) -> List[List[str]]:
     """
-    Prepare a display row for the tabular output. Columns:
+    Prepare the display rows for the tabular output. Columns per row:
       - Name
       - Network (with prefix)
       - Broadcast
@@ -245,27 +337,78 @@ def format_allocation_row(name: str, required: int, net: ipaddress.IPv4Network,
       - Subnet Mask (dotted)
       - Wildcard Mask (dotted)
       - Wasted IPs (optional)
+
+    Consumes the column arrays from allocate_vlsm directly: the broadcast/
+    netmask/wildcard/usable-range addresses for the whole plan are computed
+    as int64 arrays in one shot, then each column is rendered to dotted
+    quads with one inet_ntoa call per address.
     """
-    network_str = f"{net.network_address}/{net.prefixlen}"
-    broadcast_str = str(net.broadcast_address)
-
-    # usable host range:
-    host_bits = 32 - net.prefixlen
-    if host_bits >= 2:
-        first_usable = ipaddress.IPv4Address(int(net.network_address) + 1)
-        last_usable = ipaddress.IPv4Address(int(net.broadcast_address) - 1)
-        usable_range = f"{first_usable} - {last_usable}"
-    else:
-        # /31 and /32: no usable hosts under classic approach
-        usable_range = "N/A"
+    if not names:
+        return []
+
+    broadcast = starts | (_BLOCK_BY_PREFIX[prefixes] - 1)
+    netmask = _NETMASK_BY_PREFIX[prefixes]
+    wildcard = _WILDCARD_BY_PREFIX[prefixes]
+    first_usable = starts + 1
+    # Clamp so a hypothetical /32 (broadcast == start) can't go negative.
+    last_usable = np.maximum(broadcast - 1, 0)
+
+    start_s = [_ip_str(int(v)) for v in starts]
+    broadcast_s = [_ip_str(int(v)) for v in broadcast]
+    netmask_s = [_ip_str(int(v)) for v in netmask]
+    wildcard_s = [_ip_str(int(v)) for v in wildcard]
+    first_s = [_ip_str(int(v)) for v in first_usable]
+    last_s = [_ip_str(int(v)) for v in last_usable]
+
+    # %-formatting is the cheapest of CPython's string-building paths for
+    # these simple substitutions, and each row list is built at final size.
+    rows = []
+    for i, name in enumerate(names):
+        prefixlen = int(prefixes[i])
+        if 32 - prefixlen >= 2:
+            usable_range = "%s - %s" % (first_s[i], last_s[i])
+        else:
+            # /31 and /32: no usable hosts under classic approach
+            usable_range = "N/A"
 
-    subnet_mask = str(net.netmask)
-    wildcard = str(wildcard_from_netmask(net.netmask))
+        network_str = "%s/%d" % (start_s[i], prefixlen)
+        if extra_info:
+            row = [name, network_str, broadcast_s[i], usable_range, netmask_s[i], wildcard_s[i], "%d" % wasted[i]]
+        else:
+            row = [name, network_str, broadcast_s[i], usable_range, netmask_s[i], wildcard_s[i]]
+        rows.append(row)
+    return rows
 
-    row = [name, network_str, broadcast_str, usable_range, subnet_mask, wildcard]
-    if extra_info:
-        row.append(str(wasted))
-    return row
+
+def _format_grid(headers: List[str], rows: List[List[str]]) -> str:
+    """
+    Render a table in tabulate's "grid" style with a single specialized pass.
+
+    Widths are computed once per column with max(map(len, ...)) and each line
+    is assembled with str.join, instead of tabulate's general-purpose
+    walk-every-cell-twice machinery. Digit-only columns (e.g. Wasted IPs) are
+    right-aligned to match tabulate's numeric handling.
+    """
+    cols = list(zip(*([headers] + rows)))
+    numeric = [bool(rows) and all(cell.isdigit() for cell in col[1:]) for col in cols]
+    # tabulate pads headers by two extra spaces; keep that so output is stable.
+    widths = [max(max(map(len, col[1:]), default=0), len(col[0]) + 2) for col in cols]
+
+    sep = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    header_sep = sep.replace("-", "=")
+
+    def _line(cells: Tuple[str, ...]) -> str:
+        padded = [
+            cell.rjust(w) if num else cell.ljust(w)
+            for cell, w, num in zip(cells, widths, numeric)
+        ]
+        return "| " + " | ".join(padded) + " |"
+
+    parts = [sep, _line(tuple(headers)), header_sep]
+    for row in rows:
+        parts.append(_line(tuple(row)))
+        parts.append(sep)
+    return "\n".join(parts)
 
 
 if __name__ == "__main__":